@@ -7,77 +7,93 @@
 """
 
 if __name__ == "__main__":
+    import os
     import os.path
     import sys
 
+    from passport import arg
+
+    args = arg.release()
+
+    # Imported after parsing the arguments so that `--help` and usage errors
+    # don't pay for subprocess, pickle and friends
     from passport import (
-        arg,
         case,
         configuration,
         dialog,
         git
     )
 
-    args = arg.release()
-    config_file = os.path.expanduser("~/.gitpassport")
-
-    if (
-        not configuration.preset(config_file) or
-        not configuration.validate_scheme(config_file) or
-        not configuration.validate_values(config_file) or
-        not git.infected()
-    ):
+    # Prefer $HOME over os.path.expanduser() which has to query the
+    # password database via the pwd module if it can't find one
+    home = os.environ.get("HOME") or os.path.expanduser("~")
+    config_file = os.path.join(home, ".gitpassport")
+    cache_file = os.path.join(
+        os.environ.get("XDG_CACHE_HOME") or os.path.join(home, ".cache"),
+        "git-passport",
+        "config.pkl"
+    )
+
+    config = configuration.load(config_file, cache_file)
+    if config is None:
         sys.exit(1)
-    else:
-        config = configuration.release(config_file)
-
-    if config["enable_hook"]:
-        local_email = git.config_get(config, "local", "email")
-        local_name = git.config_get(config, "local", "name")
-        local_url = git.config_get(config, "local", "url")
-
-        if args.select:
-            local_name = None
-            local_email = None
-            git.config_remove(verbose=False)
-
-        if args.delete:
-            git.config_remove()
-            sys.exit(0)
-
-        if args.active:
-            case.active_identity(
-                config,
-                local_email,
-                local_name,
-                local_url,
-                style="compact"
-            )
-            sys.exit(0)
-
-        if args.passports:
-            dialog.print_choice(config["git_passports"])
-            exit(0)
-
-        if local_email and local_name:
-            case.active_identity(
-                config,
-                local_email,
-                local_name,
-                local_url
-            )
-            sys.exit(0)
-
-        if local_url:
-            candidates = case.url_exists(config, local_url)
-        else:
-            candidates = case.no_url_exists(config)
-
-        selected_id = dialog.get_input(candidates.keys())
-        if selected_id is not None:
-            git.config_set(config, candidates[selected_id]["email"], "email")
-            git.config_set(config, candidates[selected_id]["name"], "name")
-            sys.exit(0)
-    else:
+
+    if not config["enable_hook"]:
         print("git-passport is currently disabled.")
         sys.exit(0)
+
+    # Listing the passports doesn't need Git at all
+    if args.passports:
+        dialog.print_choice(config["git_passports"])
+        sys.exit(0)
+
+    # Reading the local Git config fails outside of a Git repository
+    local_config = git.config_list("local")
+    if local_config is None:
+        print("The current directory does not seem to be a Git repository.")
+        sys.exit(1)
+
+    local_email = local_config.get("user.email", "")
+    local_name = local_config.get("user.name", "")
+    local_url = local_config.get("remote.origin.url", "")
+
+    if args.select:
+        local_name = None
+        local_email = None
+        git.config_remove(verbose=False)
+
+    if args.delete:
+        git.config_remove()
+        sys.exit(0)
+
+    if args.active:
+        case.active_identity(
+            config,
+            local_email,
+            local_name,
+            local_url,
+            style="compact"
+        )
+        sys.exit(0)
+
+    if local_email and local_name:
+        case.active_identity(
+            config,
+            local_email,
+            local_name,
+            local_url
+        )
+        sys.exit(0)
+
+    if local_url:
+        candidates = case.url_exists(config["git_passports"], local_url)
+    else:
+        candidates = case.no_url_exists(config["git_passports"])
+
+    selected_id = dialog.get_input(candidates.keys())
+    if selected_id is not None:
+        git.config_set_many({
+            "email": candidates[selected_id]["email"],
+            "name": candidates[selected_id]["name"]
+        })
+        sys.exit(0)
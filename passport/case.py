@@ -2,17 +2,59 @@
 
 
 # ..................................................................... Imports
+import sys
 import time
-import urllib.parse
 
 from . import (
     configuration,
-    dialog,
-    util
+    dialog
+)
+
+
+# .................................................................... Messages
+_MSG_ACTIVE = (
+    "~Active Passport:\n"
+    "    . User:   {}\n"
+    "    . E-Mail: {}\n"
+    "    . Remote: {}\n"
+)
+
+_MSG_URL_MATCH = (
+    "One or more passports match your current Git provider.\n"
+    "remote.origin.url: {}\n"
+)
+
+_MSG_URL_NO_MATCH = (
+    "Zero suitable passports found - listing all passports.\n"
+    "remote.origin.url: {}\n"
 )
 
 
 # .............................................................. Case functions
+def _netloc(url):
+    """ Extract the host of a Git remote URL with plain string operations
+        instead of urllib.parse. Handles the URL forms Git itself accepts:
+        `scheme://[user@]host[:port]/path` and the scp-like `[user@]host:path`.
+
+        Args:
+            url (str): A remote.origin.url
+
+        Returns:
+            host (str): The host name, e.g. `github.com`, or an empty string
+                        for local paths
+    """
+    if "://" in url:
+        netloc = url.split("://", 1)[1].split("/", 1)[0]
+        return netloc.rpartition("@")[2].split(":", 1)[0]
+
+    # Git only treats `host:path` as scp-like if no slash precedes the colon
+    head, colon, _ = url.partition(":")
+    if colon and "/" not in head:
+        return head.rpartition("@")[2]
+
+    return ""
+
+
 def active_identity(config, email, name, url, style=None):
     """ Prints an existing ID of a local gitconfig.
 
@@ -27,96 +69,86 @@ def active_identity(config, email, name, url, style=None):
             False (bool): If an active passport could not be found
     """
     duration = config["sleep_duration"]
-    strip = "strip" if style == "compact" else "lstrip"
 
     if not url:
         url = "Not set"
 
     if email and name:
-        msg = """
-            ~Active Passport:
-                . User:   {}
-                . E-Mail: {}
-                . Remote: {}
-        """.format(
+        msg = _MSG_ACTIVE.format(
             name,
             email,
             url
         )
 
-        print(util.dedented(msg, strip))
+        print(msg.rstrip() if style == "compact" else msg)
     else:
         msg = "No passport set."
 
         print(msg)
         return False
 
-    time.sleep(duration)
+    # The pause gives the user a chance to read the passport before Git
+    # continues, which only makes sense when running as a hook on a terminal
+    if duration and style != "compact" and sys.stdout.isatty():
+        time.sleep(duration)
+
     return True
 
 
-def url_exists(config, url):
+def url_exists(git_passports, url):
     """ If a local gitconfig contains a remote.origin.url add all user defined
         Git IDs matching remote.origin.url as a candidate. However if there is
         not a single match then add all available user defined Git IDs and the
         global Git ID as candidates.
 
         Args:
-            config (dict): Contains validated configuration options
+            git_passports (dict): Contains the user defined Git IDs
             url (str): A remote.origin.url
 
         Returns:
             candidates (dict): Contains preselected Git ID candidates
     """
-    # A generator to filter matching sections by options:
-    # Let's see if user defined IDs match remote.origin.url
-    def gen_candidates(ids, url):
-        for key, value in ids.items():
-            if value.get("service") == url:
-                yield (key, value)
-
-    local_passports = config["git_passports"]
-    netloc = urllib.parse.urlparse(url)[1]
+    netloc = _netloc(url)
 
-    candidates = dict(gen_candidates(local_passports, netloc))
+    # Let's see if user defined IDs match the host of remote.origin.url
+    candidates = {
+        key: value
+        for key, value in git_passports.items()
+        if value.get("service") == netloc
+    }
 
-    if len(candidates) >= 1:
-        msg = """
-            One or more passports match your current Git provider.
-            remote.origin.url: {}
-        """.format(url)
+    if candidates:
+        msg = _MSG_URL_MATCH.format(url)
 
-        print(util.dedented(msg, "lstrip"))
+        print(msg)
     else:
-        candidates = local_passports
-        msg = """
-            Zero suitable passports found - listing all passports.
-            remote.origin.url: {}
-        """.format(url)
+        # Copy, the global ID must not end up in the passed Git IDs
+        candidates = dict(git_passports)
+        msg = _MSG_URL_NO_MATCH.format(url)
 
-        print(util.dedented(msg, "lstrip"))
-        configuration.add_global_id(config, candidates)
+        print(msg)
+        configuration.add_global_id(candidates)
 
     dialog.print_choice(candidates)
     return candidates
 
 
-def no_url_exists(config):
+def no_url_exists(git_passports):
     """ If a local gitconfig does not contain a remote.origin.url add
         all available user defined Git IDs and the global Git ID as
         candidates.
 
         Args:
-            config (dict): Contains validated configuration options
+            git_passports (dict): Contains the user defined Git IDs
 
         Returns:
             candidates (dict): Contains preselected Git ID candidates
     """
-    candidates = config["git_passports"]
+    candidates = dict(git_passports)
     msg = "«remote.origin.url» is not set, listing all passports:\n"
 
     print(msg)
-    configuration.add_global_id(config, candidates)
+    configuration.add_global_id(candidates)
     dialog.print_choice(candidates)
 
     return candidates
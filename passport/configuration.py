@@ -2,15 +2,211 @@
 
 
 # ..................................................................... Imports
-import configparser
+import os
 import os.path
+import pickle
 import re
 
-from . import (
-    git,
-    util
+from . import git
+
+
+# ................................................................... Constants
+_SECTION_RE = re.compile(r"^(passport)\s[0-9]+$")
+_HEADER_RE = re.compile(r"^\[([^\]\n]+)\][ \t]*$")
+# Like configparser, accept both `key = value` and `key: value`
+_OPTION_RE = re.compile(
+    r"^[ \t]*([^=:;#\s][^=:\n]*?)[ \t]*[=:][ \t]*(.*?)[ \t]*$"
+)
+
+_WHITELIST_SECTIONS = frozenset([
+    "general",
+    "passport"
+])
+
+_WHITELIST_OPTIONS = frozenset([
+    "email",
+    "enable_hook",
+    "name",
+    "service",
+    "sleep_duration"
+])
+
+_REQUIRED_GENERAL = ("enable_hook", "sleep_duration")
+_REQUIRED_PASSPORT = ("email", "name")
+
+# Bump whenever the layout of the released config dictionary changes so that
+# caches written by an older version are not picked up
+_CACHE_VERSION = 1
+
+# Same boolean states configparser.ConfigParser.getboolean() accepts
+_BOOLEAN_STATES = {
+    "1": True, "yes": True, "true": True, "on": True,
+    "0": False, "no": False, "false": False, "off": False
+}
+
+# Written verbatim by preset(), in the same layout configparser would produce
+_SAMPLE_CONFIG = (
+    "[general]\n"
+    "enable_hook = True\n"
+    "sleep_duration = 0.75\n"
+    "\n"
+    "[passport 0]\n"
+    "email = email_0@example.com\n"
+    "name = name_0\n"
+    "service = github.com\n"
+    "\n"
+    "[passport 1]\n"
+    "email = email_1@example.com\n"
+    "name = name_1\n"
+    "service = gitlab.com\n"
+    "\n"
+)
+
+
+# .................................................................... Messages
+_MSG_NO_CONFIG = (
+    "No configuration file found ~/.\n"
+    "Generating a sample configuration file."
 )
 
+_MSG_UNREADABLE_CONFIG = (
+    "E > Configuration > Can't read the configuration file, is it a "
+    "dangling symlink?\n"
+    ">>> {}"
+)
+
+_MSG_FALSE_SECTIONS = (
+    "E > Configuration > Invalid sections:\n"
+    ">>> {}\n"
+    "\n"
+    "Allowed sections (Passport sections scheme: \"passport 0\"):\n"
+    ">>> {}"
+)
+
+_MSG_FALSE_OPTIONS = (
+    "E > Configuration > Invalid options:\n"
+    ">>> {}\n"
+    "\n"
+    "Allowed options:\n"
+    ">>> {}"
+)
+
+_MSG_UNPARSABLE_LINES = (
+    "E > Configuration > Unparsable lines:\n"
+    ">>> {}"
+)
+
+_MSG_DUPLICATES = (
+    "E > Configuration > Duplicate sections or options:\n"
+    ">>> {}"
+)
+
+_MSG_MISSING_OPTIONS = (
+    "E > Configuration > Missing options:\n"
+    ">>> {}"
+)
+
+_MSG_FALSE_EMAIL = (
+    "E > Configuration > Invalid email address:\n"
+    ">>> {}"
+)
+
+_MSG_NO_GLOBAL_ID = (
+    "~Note\n"
+    "    Tried to add your global Git ID as a passport candidate but\n"
+    "    couldn't find one.\n"
+    "    Consider to setup a global Git ID in order to get it listed\n"
+    "    as a fallback passport.\n"
+)
+
+
+# ............................................................ Parser functions
+def _fast_parse(text):
+    """ Split the content of a configuration file into sections and their
+        key/value options. The configuration file only consists of section
+        headers, `key = value` or `key: value` lines and comments, thus two
+        regular expressions are sufficient and a lot cheaper than
+        configparser. Like configparser we don't accept duplicate sections
+        or options and lines we don't understand, but instead of raising we
+        collect them for `validate_scheme()` to report.
+
+        Args:
+            text (str): The content of a configuration file
+
+        Returns:
+            raw_config (dict): Maps section names to dicts of options
+            duplicates (list): Repeated sections and `section: option` names
+            unparsable (list): Lines which are neither a section header, an
+                               option inside a section nor a comment
+    """
+    raw_config = {}
+    duplicates = []
+    unparsable = []
+    section = None
+
+    for number, line in enumerate(text.splitlines(), 1):
+        stripped = line.strip()
+        if not stripped or stripped[0] in "#;":
+            continue
+
+        header = _HEADER_RE.match(line)
+        if header:
+            section = header.group(1)
+            if section in raw_config:
+                duplicates.append(section)
+            options = raw_config.setdefault(section, {})
+            continue
+
+        option = _OPTION_RE.match(line)
+        if option and section is not None:
+            name = option.group(1).lower()
+            if name in options:
+                duplicates.append("{}: {}".format(section, name))
+            options[name] = option.group(2)
+            continue
+
+        unparsable.append("line {}: {}".format(number, stripped))
+
+    return raw_config, duplicates, unparsable
+
+
+def _getboolean(value):
+    """ Convert a configuration value into a boolean the way
+        configparser.ConfigParser.getboolean() does.
+
+        Args:
+            value (str): An arbitrary configuration value
+
+        Returns:
+            state (bool): The boolean state of the value
+
+        Raises:
+            ValueError: If the value does not represent a boolean state
+    """
+    try:
+        return _BOOLEAN_STATES[value.lower()]
+    except KeyError:
+        raise ValueError("Not a boolean: {}".format(value))
+
+
+def _valid_email(email):
+    r""" Check an email address for a local part, an `@` and a domain which
+        contains a dot with at least one character on either side. This is
+        the loose scheme of the former `[^@]+@[^@]+\.[^@]+` pattern expressed
+        with a few string methods instead of the regex engine.
+
+        Args:
+            email (str): An email address
+
+        Returns:
+            True (bool): If the email address looks valid
+            False (bool): If the email address is invalid
+    """
+    at = email.find("@")
+    domain = email[at + 1:].split("@", 1)[0]
+
+    return at > 0 and "." in domain[1:-1]
+
 
 # ............................................................ Config functions
 def preset(filename):
@@ -24,123 +220,148 @@ def preset(filename):
             True (bool): If the configfile exists already
             False (bool): If a new configfile was successfully created
     """
-    if os.path.exists(filename):
+    # Create the file exclusively, which fails if it exists already. This
+    # replaces a separate os.path.exists() check and can't race with another
+    # process creating the file in between. The configuration contains
+    # e-mail addresses, so keep it private to the user.
+    try:
+        fd = os.open(filename, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+    except FileExistsError:
         return True
 
-    preset = configparser.ConfigParser()
+    with os.fdopen(fd, "w") as configfile:
+        print(_MSG_NO_CONFIG)
+        configfile.write(_SAMPLE_CONFIG)
 
-    preset["general"] = {}
-    preset["general"]["enable_hook"] = "True"
-    preset["general"]["sleep_duration"] = "0.75"
+    return False
 
-    preset["passport 0"] = {}
-    preset["passport 0"]["email"] = "email_0@example.com"
-    preset["passport 0"]["name"] = "name_0"
-    preset["passport 0"]["service"] = "github.com"
 
-    preset["passport 1"] = {}
-    preset["passport 1"]["email"] = "email_1@example.com"
-    preset["passport 1"]["name"] = "name_1"
-    preset["passport 1"]["service"] = "gitlab.com"
+def read(filename):
+    """ Read and parse a provided configuration file once so that the result
+        can be shared by the validation and release functions.
 
-    try:
-        msg = """
-            No configuration file found ~/.
-            Generating a sample configuration file.
-        """
+        Args:
+            filename (str): The complete `filepath` of the configuration file
 
-        print(util.dedented(msg, "strip"))
+        Returns:
+            raw_config (dict): Maps section names to dicts of options
+            duplicates (list): Repeated sections and `section: option` names
+            unparsable (list): Lines which could not be parsed
+    """
+    with open(filename, "r") as configfile:
+        return _fast_parse(configfile.read())
 
-        with open(filename, "w") as configfile:
-            preset.write(configfile)
-        return False
 
-    except Exception:
-        raise
+def hook_enabled(raw_config):
+    """ Peek at the `enable_hook` option of a parsed configuration file
+        before it gets validated, so that a disabled hook can skip the
+        validation altogether.
 
-    finally:
-        configfile.close()
+        Args:
+            raw_config (dict): Maps section names to dicts of options
+
+        Returns:
+            True (bool): If the hook is enabled or the option is missing or
+                         invalid, which `validate_values()` reports then
+            False (bool): If the hook is disabled
+    """
+    try:
+        return _getboolean(raw_config["general"]["enable_hook"])
+    except (KeyError, ValueError):
+        return True
 
 
-def validate_scheme(filename):
-    """ Validate section and option names of a provided configuration file.
-        Quit the script and tell the user if we find false names.
+def validate_scheme(raw_config, duplicates=(), unparsable=()):
+    """ Validate section and option names of a provided configuration file
+        and make sure the options we rely on are present. Quit the script
+        and tell the user if we find false, duplicate or missing names or
+        lines we couldn't parse.
 
         Args:
-            filename (str): The complete `filepath` of the configuration file
+            raw_config (dict): Maps section names to dicts of options
+            duplicates (list): Repeated names as returned by `read()`
+            unparsable (list): Unparsable lines as returned by `read()`
 
         Returns:
             True (bool): If the configfile contains valid sections and options
             False (bool): If the configfile contains false sections or options
+                          or lacks required options
     """
-    raw_config = configparser.ConfigParser()
-    raw_config.read(filename)
-
-    pattern_section = r"^(passport)\s[0-9]+$"
-    whitelist_sections = frozenset([
-        "general",
-        "passport"
-    ])
-
-    whitelist_options = frozenset([
-        "email",
-        "enable_hook",
-        "name",
-        "service",
-        "sleep_duration"
-    ])
-
-    # Create sets containing non-whitelisted section and option names
-    false_sections = set([
-        section
-        for section in raw_config.sections()
-        if section not in whitelist_sections
-        if not re.match(pattern_section, section)
-    ])
-
-    false_options = set([
-        option
-        for section in raw_config.sections()
-        for option in raw_config.options(section)
-        if option not in whitelist_options
-    ])
+    # Quit if there are lines we don't understand
+    if unparsable:
+        msg = _MSG_UNPARSABLE_LINES.format("\n>>> ".join(unparsable))
+
+        print(msg)
+        return False
+
+    # Quit if sections or options are defined more than once
+    if duplicates:
+        msg = _MSG_DUPLICATES.format(", ".join(duplicates))
+
+        print(msg)
+        return False
+
+    # Collect non-whitelisted section and option names in a single pass
+    false_sections = set()
+    false_options = set()
+
+    for section, options in raw_config.items():
+        if (
+            section not in _WHITELIST_SECTIONS and
+            not _SECTION_RE.match(section)
+        ):
+            false_sections.add(section)
+
+        false_options.update(
+            option
+            for option in options
+            if option not in _WHITELIST_OPTIONS
+        )
 
     # Quit if we have wrong section names
-    if len(false_sections):
-        msg = """
-            E > Configuration > Invalid sections:
-            >>> {}
-
-            Allowed sections (Passport sections scheme: "passport 0"):
-            >>> {}
-        """.format(
+    if false_sections:
+        msg = _MSG_FALSE_SECTIONS.format(
             ", ".join(false_sections),
-            ", ".join(whitelist_sections)
+            ", ".join(_WHITELIST_SECTIONS)
         )
 
-        print(util.dedented(msg, "strip"))
+        print(msg)
         return False
 
     # Quit if we have wrong option names
-    if len(false_options):
-        msg = """
-            E > Configuration > Invalid options:
-            >>> {}
-
-            Allowed options:
-            >>> {}
-        """.format(
+    if false_options:
+        msg = _MSG_FALSE_OPTIONS.format(
             ", ".join(false_options),
-            ", ".join(whitelist_options)
+            ", ".join(_WHITELIST_OPTIONS)
         )
 
-        print(util.dedented(msg, "strip"))
+        print(msg)
+        return False
+
+    # Quit if options we rely on later are missing
+    missing_options = [
+        "general: " + option
+        for option in _REQUIRED_GENERAL
+        if option not in raw_config.get("general", {})
+    ]
+    missing_options.extend(
+        section + ": " + option
+        for section, options in raw_config.items()
+        if _SECTION_RE.match(section)
+        for option in _REQUIRED_PASSPORT
+        if option not in options
+    )
+
+    if missing_options:
+        msg = _MSG_MISSING_OPTIONS.format(", ".join(missing_options))
+
+        print(msg)
         return False
 
     return True
 
 
-def validate_values(filename):
+def validate_values(raw_config):
     """ Validate certain values of a provided configuration file.
         Quit the script and tell the user if we find false values.
 
@@ -150,39 +371,34 @@ def validate_values(filename):
             enable_hook: Boolean
 
         Args:
-            filename (str): The complete `filepath` of the configuration file
+            raw_config (dict): Maps section names to dicts of options, must
+                               have passed `validate_scheme()`
 
         Returns:
             True (bool): If the configfile contains valid values
             False (bool): If the configfile contains invalid values
     """
     def filter_email(config):
-        pattern_section = r"^(passport)\s[0-9]+$"
-        pattern_email = r"[^@]+@[^@]+\.[^@]+"
-        for section in config.sections():
-            if re.match(pattern_section, section):
-                email = config.get(section, "email")
-                if not re.match(pattern_email, email):
+        for section, options in config.items():
+            # Only passport sections are left besides the whitelisted ones
+            # after validate_scheme(), no need to run the regex again
+            if section not in _WHITELIST_SECTIONS:
+                email = options["email"]
+                if not _valid_email(email):
                     yield email
 
-    raw_config = configparser.ConfigParser()
-    raw_config.read(filename)
-
     false_email = set(filter_email(raw_config))
 
     # Quit if we have wrong email addresses
     if len(false_email):
-        msg = """
-            E > Configuration > Invalid email address:
-            >>> {}
-        """.format(", ".join(false_email))
+        msg = _MSG_FALSE_EMAIL.format(", ".join(false_email))
 
-        print(util.dedented(msg, "strip"))
+        print(msg)
         return False
 
     # Quit if we have wrong boolean values
     try:
-        raw_config.getboolean("general", "enable_hook")
+        _getboolean(raw_config["general"]["enable_hook"])
     except ValueError:
         msg = "E > Configuration > enable_hook: Expecting True or False."
 
@@ -191,7 +407,7 @@ def validate_values(filename):
 
     # Quit if we have wrong float values
     try:
-        raw_config.getfloat("general", "sleep_duration")
+        float(raw_config["general"]["sleep_duration"])
     except ValueError:
         msg = "E > Configuration > sleep_duration: Expecting float or number."
 
@@ -201,65 +417,196 @@ def validate_values(filename):
     return True
 
 
-def release(filename):
-    """ Read a provided configuration file and «import» sections and their
+def release(raw_config):
+    """ Take a parsed configuration file and «import» sections and their
         validated keys/values into a dictionary.
 
         Args:
-            filename (str): The complete `filepath` of the configuration file
+            raw_config (dict): Maps section names to dicts of options, must
+                               have passed `validate_scheme()`
 
         Returns:
             config (dict): Contains all allowed configuration sections
     """
-    def passport(config):
-        pattern_section = r"^(passport)\s[0-9]+$"
-        for passport in config.items():
-            if re.match(pattern_section, passport[0]):
-                yield dict(passport[1])
-
-    raw_config = configparser.ConfigParser()
-    raw_config.read(filename)
+    general = raw_config["general"]
 
     config = {}
-    config["enable_hook"] = raw_config.getboolean("general", "enable_hook")
-    config["sleep_duration"] = raw_config.getfloat("general", "sleep_duration")
-    config["git_passports"] = dict(enumerate(passport(raw_config)))
+    config["enable_hook"] = _getboolean(general["enable_hook"])
+    config["sleep_duration"] = float(general["sleep_duration"])
+    config["git_passports"] = {
+        key: dict(raw_config[section])
+        for key, section in enumerate(
+            section
+            for section in raw_config
+            if section not in _WHITELIST_SECTIONS
+        )
+    }
+
+    return config
+
+
+def cache_key(filename):
+    """ Compute a key which changes whenever a provided configuration file
+        gets modified or a different configuration file is used.
+
+        Args:
+            filename (str): The complete `filepath` of the configuration file
+
+        Returns:
+            key (tuple): Cache version, absolute path, mtime in nanoseconds
+                         and size of the configuration file
+    """
+    stat = os.stat(filename)
+
+    return (
+        _CACHE_VERSION,
+        os.path.abspath(filename),
+        stat.st_mtime_ns,
+        stat.st_size
+    )
+
+
+def cache_load(cache_file, key):
+    """ Load a previously released configuration from the cache file
+        if it was stored under the same key.
+
+        Args:
+            cache_file (str): The complete `filepath` of the cache file
+            key (tuple): The key returned by `cache_key()`
+
+        Returns:
+            config (dict): Contains validated configuration options
+            None (NoneType): If the cache is missing, stale or unreadable
+    """
+    try:
+        with open(cache_file, "rb") as cachefile:
+            cached_key, config = pickle.load(cachefile)
+    # A missing or corrupt cache simply means we have to parse again
+    except Exception:
+        return None
+
+    if cached_key != key:
+        return None
 
     return config
 
 
-def add_global_id(config, target):
+def cache_dump(cache_file, key, config):
+    """ Store a released configuration in the cache file. The file is
+        written to a temporary file first and atomically moved into place.
+
+        Args:
+            cache_file (str): The complete `filepath` of the cache file
+            key (tuple): The key returned by `cache_key()`
+            config (dict): Contains validated configuration options
+
+        Returns:
+            True (bool): If the cache file could be written
+            False (bool): If the cache file could not be written
+    """
+    temp_file = "{}.{}.tmp".format(cache_file, os.getpid())
+
+    # The cache holds the e-mail addresses and names of all passports, so
+    # keep it private to the user
+    try:
+        os.makedirs(os.path.dirname(cache_file), mode=0o700, exist_ok=True)
+
+        fd = os.open(temp_file, os.O_WRONLY | os.O_CREAT | os.O_EXCL, 0o600)
+        with os.fdopen(fd, "wb") as cachefile:
+            pickle.dump((key, config), cachefile)
+
+        os.replace(temp_file, cache_file)
+
+    # The cache is an optimization only, never fail because of it
+    except OSError:
+        try:
+            os.remove(temp_file)
+        except OSError:
+            pass
+
+        return False
+
+    return True
+
+
+def load(filename, cache_file):
+    """ Load the configuration file in one go: Create a sample configuration
+        if none exists yet, reuse the cached configuration as long as the
+        file is unchanged and otherwise read, validate, release and cache it.
+
+        Args:
+            filename (str): The complete `filepath` of the configuration file
+            cache_file (str): The complete `filepath` of the cache file
+
+        Returns:
+            config (dict): Contains validated configuration options or only
+                           `enable_hook` if the hook is disabled
+            None (NoneType): If a sample configuration was created or the
+                             configuration file is invalid
+    """
+    # A single stat() tells us whether the configuration file exists and
+    # whether the cached configuration is still up to date
+    try:
+        key = cache_key(filename)
+    except FileNotFoundError:
+        if not preset(filename):
+            return None
+
+        # preset() found something in the way, either another process just
+        # created the file or it is a dangling symlink
+        try:
+            key = cache_key(filename)
+        except FileNotFoundError:
+            msg = _MSG_UNREADABLE_CONFIG.format(filename)
+
+            print(msg)
+            return None
+
+    config = cache_load(cache_file, key)
+    if config is not None:
+        return config
+
+    raw_config, duplicates, unparsable = read(filename)
+
+    # Don't bother validating a configuration which disables the hook
+    if not hook_enabled(raw_config):
+        return {"enable_hook": False}
+
+    if (
+        not validate_scheme(raw_config, duplicates, unparsable) or
+        not validate_values(raw_config)
+    ):
+        return None
+
+    config = release(raw_config)
+    cache_dump(cache_file, key, config)
+
+    return config
+
+
+def add_global_id(target):
     """ If available add the global Git ID as a fallback ID to a
         dictionary containing potential preselected candidates.
 
         Args:
-            config (dict): Contains validated configuration options
             target (dict): Contains preselected local Git IDs
 
         Returns:
             True (bool): If a global Git ID could be found
             False (bool): If a global Git ID could not be found
     """
-    global_email = git.config_get(config, "global", "email")
-    global_name = git.config_get(config, "global", "name")
-    local_passports = config["git_passports"]
+    global_config = git.config_list("global") or {}
+    global_email = global_config.get("user.email", "")
+    global_name = global_config.get("user.name", "")
 
     if global_email and global_name:
-        position = len(local_passports)
+        position = len(target)
         target[position] = {}
         target[position]["email"] = global_email
         target[position]["name"] = global_name
         target[position]["flag"] = "global"
     else:
-        msg = """
-            ~Note
-                Tried to add your global Git ID as a passport candidate but
-                couldn't find one.
-                Consider to setup a global Git ID in order to get it listed
-                as a fallback passport.
-        """
-
-        print(util.dedented(msg, "lstrip"))
+        print(_MSG_NO_GLOBAL_ID)
         return False
 
     return True
@@ -4,7 +4,26 @@
 # ..................................................................... Imports
 import sys
 
-from . import util
+
+# .................................................................... Messages
+_MSG_GLOBAL_ID = (
+    "~:Global ID: {}\n"
+    "    . User:   {}\n"
+    "    . E-Mail: {}\n"
+)
+
+_MSG_PASSPORT_SERVICE = (
+    "~Passport ID: {}\n"
+    "    . User:    {}\n"
+    "    . E-Mail:  {}\n"
+    "    . Service: {}\n"
+)
+
+_MSG_PASSPORT = (
+    "~:Passport ID: {}\n"
+    "    . User:   {}\n"
+    "    . E-Mail: {}\n"
+)
 
 
 # ............................................................ Dialog functions
@@ -20,27 +39,34 @@ def get_input(pool):
             None (NoneType): If the user quits the selection dialog
             selection (int): A number representing a Git ID chosen by a user
     """
-    while True:
-        # Redirect sys.stdin to an open filehandle from which input()
-        # is able to read
-        sys.stdin = open("/dev/tty")
-        selection = input("» Select an [ID] or enter «(q)uit» to exit: ")
+    prompt = "» Select an [ID] or enter «(q)uit» to exit: "
+
+    # Git hooks don't get a terminal on stdin, so read straight from the
+    # controlling terminal. Open it once, not for every retry.
+    with open("/dev/tty") as tty:
+        while True:
+            sys.stdout.write(prompt)
+            sys.stdout.flush()
+            selection = tty.readline()
+
+            # The terminal went away, treat it like quitting
+            if not selection:
+                return None
 
-        try:
-            selection = int(selection)
+            selection = selection.strip()
 
-            if selection in pool:
-                return selection
+            # isdecimal() accepts decimal digits of any script, all of which
+            # int() parses. Unlike int() it rejects spellings like "+1" or
+            # "1_0", and unlike isdigit() it doesn't let superscripts through
+            # to int(), which would raise.
+            if selection.isdecimal():
+                selection = int(selection)
 
-        except ValueError:
-            if selection == "q" or selection == "quit":
-                return None
-            continue
+                if selection in pool:
+                    return selection
 
-        # Reset sys.stdin to its default value, even if we return early
-        # when an exception occurs
-        finally:
-            sys.stdin = sys.__stdin__
+            elif selection == "q" or selection == "quit":
+                return None
 
 
 def print_choice(choice):
@@ -54,44 +80,33 @@ def print_choice(choice):
         Returns:
             True (bool): On success
     """
+    msgs = []
+
     for key, value in choice.items():
         if value.get("flag") == "global":
-            msg = """
-                ~:Global ID: {}
-                    . User:   {}
-                    . E-Mail: {}
-            """.format(
+            msg = _MSG_GLOBAL_ID.format(
                 key,
                 value["name"],
                 value["email"]
             )
-
-            print(util.dedented(msg, "lstrip"))
         elif value.get("service"):
-            msg = """
-                ~Passport ID: {}
-                    . User:    {}
-                    . E-Mail:  {}
-                    . Service: {}
-            """.format(
+            msg = _MSG_PASSPORT_SERVICE.format(
                 key,
                 value["name"],
                 value["email"],
                 value["service"]
             )
-
-            print(util.dedented(msg, "lstrip"))
         else:
-            msg = """
-                ~:Passport ID: {}
-                    . User:   {}
-                    . E-Mail: {}
-            """.format(
+            msg = _MSG_PASSPORT.format(
                 key,
                 value["name"],
                 value["email"]
             )
 
-            print(util.dedented(msg, "lstrip"))
+        msgs.append(msg)
+
+    # Print the whole list at once instead of one print() per Git ID
+    if msgs:
+        print("\n".join(msgs))
 
     return True
@@ -2,100 +2,158 @@
 
 
 # ..................................................................... Imports
+import shutil
 import subprocess
 
 
-# ............................................................... Git functions
-def infected():
-    """ Checks if the current directory is under Git version control.
+# ................................................................... Constants
+# Git config option names of the properties we handle
+_PROPERTY_KEY = {
+    "email": "user.email",
+    "name": "user.name"
+}
 
-        Returns:
-            True (bool): If the current directory is a Git repository
-            False (bool): If the current directory is not a Git repository
+_SCOPE_FLAG = {
+    "global": "--global",
+    "local": "--local"
+}
 
-        Raises:
-            Exception: If subprocess.Popen() fails
-    """
-    try:
-        git_process = subprocess.Popen([
-            "git",
-            "rev-parse",
-            "--is-inside-work-tree"
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
 
-        # Captures the git return code
-        exit_status = git_process.wait()
+# ....................................................................... Cache
+# Parsed `git config --list` output per scope, see `config_list()`
+_config_cache = {}
 
-        if exit_status == 0:
-            return True
-        elif exit_status == 128:
-            msg = "The current directory does not seem to be a Git repository."
-
-            print(msg)
-            return False
+# Resolve git once. subprocess.Popen() only takes its posix_spawn() fast path
+# for an executable given with a directory and for close_fds=False, see
+# `_run()`. If git can't be found let subprocess raise the usual error.
+_git_executable = shutil.which("git") or "git"
 
-    except Exception:
-        raise
 
+# ............................................................... Git functions
+def _run(git_args, **kwargs):
+    """ Run git with the provided arguments and wait for it to finish.
 
-def config_get(config, scope, property):
-    """ Get the email address, username of the global or local Git ID.
-        Also gets the local remote.origin.url of a Git repository.
+        On Linux and macOS subprocess creates the child via posix_spawn()
+        (vfork semantics) instead of fork() + exec() when we pass an absolute
+        executable and keep close_fds disabled. Our own file descriptors are
+        non-inheritable by default (PEP 446), so nothing leaks into git.
+        Other platforms like Windows simply ignore this and fall back to
+        their regular process creation.
 
         Args:
-            config (dict): Contains validated configuration options
-            scope (str): Search inside a `global` or `local` scope
-            property (str): Type of `email` or `name` or `url`
+            git_args (list): Arguments passed to git, e.g. ["config", "-l"]
+            kwargs (dict): Further keyword arguments for subprocess.run()
 
         Returns:
-            value (str): A name, email address or url
+            git_process (obj): A subprocess.CompletedProcess object
 
         Raises:
-            Exception: If subprocess.Popen() fails
+            Exception: If subprocess.run() fails
     """
-    git_args = "remote.origin.url" if property == "url" else "user." + property
+    return subprocess.run(
+        [_git_executable] + git_args,
+        close_fds=False,
+        **kwargs
+    )
 
-    try:
-        git_process = subprocess.Popen([
-            "git",
-            "config",
-            "--get",
-            "--" + scope,
-            git_args
-        ], stdout=subprocess.PIPE)
 
-        value = git_process.communicate()[0].decode("utf-8")
-        return value.replace("\n", "")
+def config_list(scope):
+    """ Get all options of the global or local Git configuration with a
+        single Git process instead of spawning one process per option.
+        The result is memoized per scope for the lifetime of the process.
 
-    except Exception:
-        raise
+        Args:
+            scope (str): Search inside a `global` or `local` scope
 
+        Returns:
+            options (dict): Maps option names like `user.email` to values
+            None (NoneType): If the scope can not be read, e.g. the local
+                             scope outside of a Git repository
 
-def config_set(config, value, property):
+        Raises:
+            Exception: If subprocess.run() fails
+    """
+    if scope in _config_cache:
+        return _config_cache[scope]
+
+    git_process = _run([
+        "config",
+        _SCOPE_FLAG[scope],
+        "--null",
+        "--list"
+    ], stdout=subprocess.PIPE, stderr=subprocess.DEVNULL)
+
+    # Captures the git return code, reporting it is up to the caller
+    if git_process.returncode == 128:
+        _config_cache[scope] = None
+        return None
+
+    # Entries are separated by NUL, keys from values by the first newline.
+    # The listing covers the whole scope, don't let a stray non-UTF-8 byte
+    # in some unrelated option abort the hook.
+    options = {}
+    stdout = git_process.stdout.decode("utf-8", "replace")
+    for entry in stdout.split("\0"):
+        if entry:
+            key, _, value = entry.partition("\n")
+            options[key] = value
+
+    _config_cache[scope] = options
+    return options
+
+
+def config_set(value, property):
     """ Set the email address or username as a local Git ID for a repository.
 
         Args:
-            config (dict): Contains validated configuration options
             value (str): A name or email address
             property (str): Type of `email` or `name`
 
         Returns:
             True (bool): On success
+            False (bool): If git failed to set the property
+
+        Raises:
+            Exception: If subprocess.run() fails
+    """
+    # The local config is about to change, drop what we have read before
+    _config_cache.pop("local", None)
+
+    # Wait for git so the identity is written before the hook returns
+    git_process = _run([
+        "config",
+        "--local",
+        _PROPERTY_KEY[property],
+        value
+    ], stdout=subprocess.DEVNULL)
+
+    return git_process.returncode == 0
+
+
+def config_set_many(values):
+    """ Set several properties of the local Git ID for a repository at once.
+        Properties which already hold the requested value in the local
+        config we have read before are skipped, so no git process is
+        spawned for them.
+
+        Args:
+            values (dict): Maps properties `email` or `name` to their values
+
+        Returns:
+            True (bool): On success
+            False (bool): If git failed to set a property
 
         Raises:
-            Exception: If subprocess.Popen() fails
+            Exception: If subprocess.run() fails
     """
-    try:
-        subprocess.Popen([
-            "git",
-            "config",
-            "--local",
-            "user." + property,
-            value
-        ], stdout=subprocess.PIPE)
-
-    except Exception:
-        raise
+    current = _config_cache.get("local") or {}
+
+    for property, value in values.items():
+        if current.get(_PROPERTY_KEY[property]) == value:
+            continue
+
+        if not config_set(value, property):
+            return False
 
     return True
 
@@ -107,29 +165,27 @@ def config_remove(verbose=True):
             True (bool): On success
 
         Raises:
-            Exception: If subprocess.Popen() fails
+            Exception: If subprocess.run() fails
     """
-    try:
-        git_process = subprocess.Popen([
-            "git",
-            "config",
-            "--local",
-            "--remove-section",
-            "user"
-        ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-
-        # Captures the git return code
-        exit_status = git_process.wait()
-
-        if verbose:
-            if exit_status == 0:
-                msg = "Passport removed."
-            elif exit_status == 128:
-                msg = "No passport set."
-
-            print(msg)
-
-    except Exception:
-        raise
+    # The local config is about to change, drop what we have read before
+    _config_cache.pop("local", None)
+
+    git_process = _run([
+        "config",
+        "--local",
+        "--remove-section",
+        "user"
+    ], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    # Captures the git return code
+    exit_status = git_process.returncode
+
+    if verbose:
+        if exit_status == 0:
+            msg = "Passport removed."
+        elif exit_status == 128:
+            msg = "No passport set."
+
+        print(msg)
 
     return True
@@ -0,0 +1,129 @@
+# -*- coding: utf-8 -*-
+
+
+# ..................................................................... Imports
+import contextlib
+import io
+import os
+import stat
+import tempfile
+import unittest
+
+from passport import configuration
+
+
+# ....................................................................... Tests
+class FastParseTest(unittest.TestCase):
+    def test_both_delimiters(self):
+        raw_config, duplicates, unparsable = configuration._fast_parse(
+            "[passport 0]\n"
+            "email: a@b.co\n"
+            "Name = n\n"
+            "service = example.com:22\n"
+        )
+
+        self.assertEqual(raw_config, {"passport 0": {
+            "email": "a@b.co",
+            "name": "n",
+            "service": "example.com:22"
+        }})
+        self.assertEqual(duplicates, [])
+        self.assertEqual(unparsable, [])
+
+    def test_duplicates(self):
+        _, duplicates, _ = configuration._fast_parse(
+            "[passport 0]\n"
+            "email = a@b.co\n"
+            "EMAIL = c@d.co\n"
+            "[passport 0]\n"
+        )
+
+        self.assertEqual(duplicates, ["passport 0: email", "passport 0"])
+
+    def test_unparsable(self):
+        _, _, unparsable = configuration._fast_parse(
+            "name = outside\n"
+            "[passport 0\n"
+            "email foo@bar.com\n"
+            "  ; comment\n"
+        )
+
+        self.assertEqual(unparsable, [
+            "line 1: name = outside",
+            "line 2: [passport 0",
+            "line 3: email foo@bar.com"
+        ])
+
+    def test_validate_scheme_reports_problems(self):
+        raw_config = {"general": {
+            "enable_hook": "True",
+            "sleep_duration": "0"
+        }}
+
+        self.assertTrue(configuration.validate_scheme(raw_config))
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            valid = configuration.validate_scheme(
+                raw_config,
+                duplicates=["general"]
+            )
+
+        self.assertFalse(valid)
+        self.assertIn(">>> general", out.getvalue())
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            valid = configuration.validate_scheme(
+                raw_config,
+                unparsable=["line 1: foo"]
+            )
+
+        self.assertFalse(valid)
+        self.assertIn(">>> line 1: foo", out.getvalue())
+
+
+class CacheTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def test_dump_is_private(self):
+        cache_file = os.path.join(self.tempdir.name, "cache", "config.pkl")
+        config = {"enable_hook": True, "git_passports": {}}
+
+        self.assertTrue(configuration.cache_dump(cache_file, "key", config))
+
+        cache_dir = os.stat(os.path.dirname(cache_file))
+        self.assertEqual(stat.S_IMODE(cache_dir.st_mode) & 0o077, 0)
+        self.assertEqual(stat.S_IMODE(os.stat(cache_file).st_mode), 0o600)
+        self.assertEqual(configuration.cache_load(cache_file, "key"), config)
+
+    def test_key_includes_path(self):
+        first = os.path.join(self.tempdir.name, "first")
+        second = os.path.join(self.tempdir.name, "second")
+
+        for filename in (first, second):
+            with open(filename, "w") as configfile:
+                configfile.write("[general]\n")
+            os.utime(filename, ns=(0, 0))
+
+        self.assertNotEqual(
+            configuration.cache_key(first),
+            configuration.cache_key(second)
+        )
+
+
+class LoadTest(unittest.TestCase):
+    def setUp(self):
+        self.tempdir = tempfile.TemporaryDirectory()
+        self.addCleanup(self.tempdir.cleanup)
+
+    def test_dangling_symlink(self):
+        config_file = os.path.join(self.tempdir.name, ".gitpassport")
+        cache_file = os.path.join(self.tempdir.name, "config.pkl")
+        os.symlink(os.path.join(self.tempdir.name, "nowhere"), config_file)
+
+        with contextlib.redirect_stdout(io.StringIO()) as out:
+            config = configuration.load(config_file, cache_file)
+
+        self.assertIsNone(config)
+        self.assertIn("dangling symlink", out.getvalue())
@@ -0,0 +1,42 @@
+# -*- coding: utf-8 -*-
+
+
+# ..................................................................... Imports
+import contextlib
+import io
+import unittest
+import unittest.mock
+
+from passport import dialog
+
+
+# ....................................................................... Tests
+class GetInputTest(unittest.TestCase):
+    def get_input(self, typed, pool=(0, 1, 3)):
+        """ Run `dialog.get_input()` with `typed` as terminal input. """
+        tty = unittest.mock.patch.object(
+            dialog,
+            "open",
+            create=True,
+            return_value=io.StringIO(typed)
+        )
+
+        with tty, contextlib.redirect_stdout(io.StringIO()):
+            return dialog.get_input(pool)
+
+    def test_ascii_digits(self):
+        self.assertEqual(self.get_input("1\n"), 1)
+        self.assertEqual(self.get_input(" 3 \n"), 3)
+
+    def test_other_decimal_digits(self):
+        self.assertEqual(self.get_input("٣\n"), 3)
+
+    def test_rejected_input(self):
+        for typed in ("+1", "1_0", "¹", "2", "x"):
+            with self.subTest(typed=typed):
+                self.assertIsNone(self.get_input(typed + "\n"))
+
+    def test_quit(self):
+        self.assertIsNone(self.get_input("q\n1\n"))
+        self.assertIsNone(self.get_input("quit\n1\n"))
+        self.assertEqual(self.get_input("x\n1\n"), 1)